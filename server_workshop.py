@@ -4,8 +4,11 @@ MCP Workshop Server - STDIO Transport Version for Claude Desktop
 This is a standalone version that uses STDIO transport instead of HTTP.
 """
 import asyncio
+import functools
 import sys
 from pathlib import Path
+from types import MappingProxyType
+from typing import Awaitable, Callable
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -16,6 +19,12 @@ from mcp import types
 from pydantic import AnyUrl
 import logging
 
+# Compiled JSON Schema validators (optional; falls back to the MCP SDK's jsonschema check)
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,240 +34,335 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Import Business Central client
-from client import BusinessCentralClient
-
-# Initialize Business Central client
-bc_client = BusinessCentralClient()
+from client import get_bc_client, close_bc_client
+from azure_auth import token_manager
 
 # Create MCP server instance
 mcp_server = Server("bc-workshop-server")
 
+# Static tool catalog (built once, returned on every tools/list).
+# Payloads are developer-authored, so model_construct skips pydantic validation.
+_TOOLS: list[types.Tool] = [
+    types.Tool.model_construct(
+        name="get_customers",
+        description="🏢 Get customer list from Business Central",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "top": {
+                    "type": "integer",
+                    "description": "Maximum number of customers to return (default: 20)"
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool.model_construct(
+        name="get_items",
+        description="📦 Get items list from Business Central",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "top": {
+                    "type": "integer", 
+                    "description": "Maximum number of items to return (default: 20)"
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool.model_construct(
+        name="get_sales_orders",
+        description="🛒 Get sales orders from Business Central",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "top": {
+                    "type": "integer",
+                    "description": "Maximum number of orders to return (default: 10)"
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool.model_construct(
+        name="get_customer_details",
+        description="🔍 Get detailed information about a specific customer",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "customer_id": {
+                    "type": "string",
+                    "description": "Customer unique ID"
+                }
+            },
+            "required": ["customer_id"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool.model_construct(
+        name="get_item_details",
+        description="🔍 Get detailed information about a specific item",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "item_no": {
+                    "type": "string",
+                    "description": "Item number"
+                }
+            },
+            "required": ["item_no"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool.model_construct(
+        name="get_currency_exchange_rates",
+        description="💱 Get currency exchange rates from Business Central",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "top": {
+                    "type": "integer",
+                    "description": "Maximum number of rates to return (default: 20)"
+                }
+            },
+            "additionalProperties": False
+        }
+    ),
+]
+
+# Static prompt catalog
+_PROMPTS: list[types.Prompt] = [
+    types.Prompt.model_construct(
+        name="customer_analysis",
+        description="🏢 Detailed customer analysis with Business Central insights",
+        arguments=[
+            types.PromptArgument.model_construct(
+                name="customer_id",
+                description="Customer ID to analyze",
+                required=True
+            )
+        ]
+    ),
+    types.Prompt.model_construct(
+        name="vendor_analysis",
+        description="🏭 Detailed vendor analysis",
+        arguments=[
+            types.PromptArgument.model_construct(
+                name="vendor_id",
+                description="Vendor ID to analyze",
+                required=True
+            )
+        ]
+    )
+]
+
+# Static resource catalog
+_RESOURCES: list[types.Resource] = [
+    types.Resource.model_construct(
+        uri=AnyUrl("file://data/customers.csv"),
+        name="Customer Data",
+        description="📊 Customer data in CSV format",
+        mimeType="text/csv"
+    ),
+    types.Resource.model_construct(
+        uri=AnyUrl("file://data/items.csv"),
+        name="Item Data",
+        description="📦 Item/product data in CSV format",
+        mimeType="text/csv"
+    ),
+    types.Resource.model_construct(
+        uri=AnyUrl("file://data/prices.csv"),
+        name="Item Prices",
+        description="💰 Item price data in CSV format",
+        mimeType="text/csv"
+    ),
+    types.Resource.model_construct(
+        uri=AnyUrl("file://data/vendors.csv"),
+        name="Vendor Data",
+        description="🏭 Vendor data in CSV format",
+        mimeType="text/csv"
+    )
+]
+
+# Argument validators compiled once from each tool's inputSchema
+_VALIDATORS = (
+    {tool.name: fastjsonschema.compile(tool.inputSchema) for tool in _TOOLS}
+    if fastjsonschema else {}
+)
+
 @mcp_server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """📋 List all available tools"""
+    return _TOOLS
+
+# Shared read-only stand-in for customers without an address (no per-row {} allocation)
+_NO_ADDRESS = MappingProxyType({})
+
+# Tool implementations (one coroutine per tool, looked up by name in _DISPATCH)
+async def _tool_get_customers(arguments: dict) -> list[types.TextContent]:
+    top = arguments.get("top", 20)
+    bc_client = await get_bc_client()
+    customers = await bc_client.get_customers(top=top)
+    
+    parts = [f"🏢 **Business Central Customers** (Showing {len(customers)} results)\n\n"]
+    append = parts.append
+    for customer in customers:
+        address = customer.get('address') or _NO_ADDRESS
+        append(
+            f"• **{customer.get('displayName', 'N/A')}** (ID: {customer.get('id', 'N/A')})\n"
+            f"  📍 {address.get('city', 'N/A')}\n"
+            f"  📞 {customer.get('phoneNumber', 'N/A')}\n"
+        )
+    return [types.TextContent.model_construct(type="text", text="".join(parts))]
+
+async def _tool_get_items(arguments: dict) -> list[types.TextContent]:
+    top = arguments.get("top", 20)
+    bc_client = await get_bc_client()
+    items = await bc_client.get_items(top=top)
+    
+    parts = [f"📦 **Business Central Items** (Showing {len(items)} results)\n\n"]
+    append = parts.append
+    for item in items:
+        append(
+            f"• **{item.get('displayName', 'N/A')}** (No: {item.get('number', 'N/A')})\n"
+            f"  💰 Price: {item.get('unitPrice', 0)}\n"
+            f"  📊 Stock: {item.get('inventory', 0)}\n"
+        )
+    return [types.TextContent.model_construct(type="text", text="".join(parts))]
+
+async def _tool_get_sales_orders(arguments: dict) -> list[types.TextContent]:
+    top = arguments.get("top", 10)
+    bc_client = await get_bc_client()
+    orders = await bc_client.get_orders(top=top)
+    
+    parts = [f"🛒 **Sales Orders** (Showing {len(orders)} results)\n\n"]
+    append = parts.append
+    for order in orders:
+        append(
+            f"• **Order {order.get('number', 'N/A')}** - Customer: {order.get('customerName', 'N/A')}\n"
+            f"  💰 Total: {order.get('totalAmountIncludingTax', 0)}\n"
+            f"  📅 Date: {order.get('orderDate', 'N/A')}\n"
+        )
+    return [types.TextContent.model_construct(type="text", text="".join(parts))]
+
+async def _tool_get_customer_details(arguments: dict) -> list[types.TextContent]:
+    # `required` only checks the key is present; an empty string still has to be rejected here
+    customer_id = arguments.get("customer_id")
+    if not customer_id:
+        return [types.TextContent.model_construct(type="text", text="❌ Error: customer_id is required")]
+    bc_client = await get_bc_client()
+    customer = await bc_client.get_customer_by_id(customer_id)
+    if not customer:
+        return [types.TextContent.model_construct(type="text", text=f"❌ Customer not found: {customer_id}")]
+    
+    address = customer.get('address') or _NO_ADDRESS
     return [
-        types.Tool(
-            name="get_customers",
-            description="🏢 Get customer list from Business Central",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "top": {
-                        "type": "integer",
-                        "description": "Maximum number of customers to return (default: 20)"
-                    }
-                },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_items",
-            description="📦 Get items list from Business Central",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "top": {
-                        "type": "integer", 
-                        "description": "Maximum number of items to return (default: 20)"
-                    }
-                },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_sales_orders",
-            description="🛒 Get sales orders from Business Central",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "top": {
-                        "type": "integer",
-                        "description": "Maximum number of orders to return (default: 10)"
-                    }
-                },
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_customer_details",
-            description="🔍 Get detailed information about a specific customer",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "customer_id": {
-                        "type": "string",
-                        "description": "Customer unique ID"
-                    }
-                },
-                "required": ["customer_id"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_item_details",
-            description="🔍 Get detailed information about a specific item",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "item_no": {
-                        "type": "string",
-                        "description": "Item number"
-                    }
-                },
-                "required": ["item_no"],
-                "additionalProperties": False
-            }
-        ),
-        types.Tool(
-            name="get_currency_exchange_rates",
-            description="💱 Get currency exchange rates from Business Central",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "top": {
-                        "type": "integer",
-                        "description": "Maximum number of rates to return (default: 20)"
-                    }
-                },
-                "additionalProperties": False
-            }
-        ),
+        types.TextContent.model_construct(
+            type="text",
+            text=f"🏢 **Customer Details**\n\n"
+                 f"**Name:** {customer.get('displayName', 'N/A')}\n"
+                 f"**ID:** {customer.get('id', 'N/A')}\n"
+                 f"**Phone:** {customer.get('phoneNumber', 'N/A')}\n"
+                 f"**Email:** {customer.get('email', 'N/A')}\n"
+                 f"**Address:** {address.get('street', 'N/A')}, "
+                 f"{address.get('city', 'N/A')}\n"
+                 f"**Country:** {address.get('countryLetterCode', 'N/A')}\n"
+        )
     ]
 
-@mcp_server.call_tool()
-async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
+async def _tool_get_item_details(arguments: dict) -> list[types.TextContent]:
+    item_no = arguments.get("item_no")
+    if not item_no:
+        return [types.TextContent.model_construct(type="text", text="❌ Error: item_no is required")]
+    bc_client = await get_bc_client()
+    item = await bc_client.get_item_by_number(item_no)
+    if not item:
+        return [types.TextContent.model_construct(type="text", text=f"❌ Item not found: {item_no}")]
+    
+    return [
+        types.TextContent.model_construct(
+            type="text",
+            text=f"📦 **Item Details**\n\n"
+                 f"**Name:** {item.get('displayName', 'N/A')}\n"
+                 f"**Number:** {item.get('number', 'N/A')}\n"
+                 f"**Price:** {item.get('unitPrice', 0)}\n"
+                 f"**Stock:** {item.get('inventory', 0)}\n"
+                 f"**Category:** {item.get('itemCategoryCode', 'N/A')}\n"
+                 f"**Unit of measure:** {item.get('baseUnitOfMeasure', 'N/A')}\n"
+        )
+    ]
+
+async def _tool_get_currency_exchange_rates(arguments: dict) -> list[types.TextContent]:
+    top = arguments.get("top", 20)
+    bc_client = await get_bc_client()
+    rates = await bc_client.get_currency_exchange_rates(top=top)
+    
+    parts = [f"💱 **Currency Exchange Rates** (Showing {len(rates)} results)\n\n"]
+    append = parts.append
+    for rate in rates:
+        # Only look up the fallback field when the preferred one is absent
+        if 'relationalExchangeRateAmount' in rate:
+            amount = rate['relationalExchangeRateAmount']
+        else:
+            amount = rate.get('exchangeRateAmount', 'N/A')
+        append(
+            f"• **{rate.get('currencyCode', 'N/A')}** - Rate: {amount}\n"
+            f"  📅 Start date: {rate.get('startingDate', 'N/A')}\n"
+        )
+    return [types.TextContent.model_construct(type="text", text="".join(parts))]
+
+# Tool name -> implementation (O(1) lookup instead of an if/elif chain)
+_DISPATCH: dict[str, Callable[[dict], Awaitable[list[types.TextContent]]]] = {
+    "get_customers": _tool_get_customers,
+    "get_items": _tool_get_items,
+    "get_sales_orders": _tool_get_sales_orders,
+    "get_customer_details": _tool_get_customer_details,
+    "get_item_details": _tool_get_item_details,
+    "get_currency_exchange_rates": _tool_get_currency_exchange_rates,
+}
+
+# The SDK re-validates with interpreted jsonschema only when no compiled validators exist
+@mcp_server.call_tool(validate_input=not _VALIDATORS)
+async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent] | types.CallToolResult:
     """🔧 Execute a tool"""
     
     if arguments is None:
         arguments = {}
     
     try:
-        logger.info(f"📞 Calling tool: {name} with arguments: {arguments}")
-        
-        if name == "get_customers":
-            top = arguments.get("top", 20)
-            customers = await bc_client.get_customers(top=top)
-            
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"🏢 **Business Central Customers** (Showing {len(customers)} results)\n\n" +
-                         "\n".join([
-                             f"• **{customer.get('displayName', 'N/A')}** (ID: {customer.get('id', 'N/A')})\n"
-                             f"  📍 {customer.get('address', {}).get('city', 'N/A')}\n"
-                             f"  📞 {customer.get('phoneNumber', 'N/A')}\n"
-                             for customer in customers
-                         ])
-                )
-            ]
-        
-        elif name == "get_items":
-            top = arguments.get("top", 20)
-            items = await bc_client.get_items(top=top)
-            
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"📦 **Business Central Items** (Showing {len(items)} results)\n\n" +
-                         "\n".join([
-                             f"• **{item.get('displayName', 'N/A')}** (No: {item.get('number', 'N/A')})\n"
-                             f"  💰 Price: {item.get('unitPrice', 0)}\n"
-                             f"  📊 Stock: {item.get('inventory', 0)}\n"
-                             for item in items
-                         ])
-                )
-            ]
-        
-        elif name == "get_sales_orders":
-            top = arguments.get("top", 10)
-            orders = await bc_client.get_orders(top=top)
-            
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"🛒 **Sales Orders** (Showing {len(orders)} results)\n\n" +
-                         "\n".join([
-                             f"• **Order {order.get('number', 'N/A')}** - Customer: {order.get('customerName', 'N/A')}\n"
-                             f"  💰 Total: {order.get('totalAmountIncludingTax', 0)}\n"
-                             f"  📅 Date: {order.get('orderDate', 'N/A')}\n"
-                             for order in orders
-                         ])
-                )
-            ]
-        
-        elif name == "get_customer_details":
-            customer_id = arguments.get("customer_id")
-            if not customer_id:
-                return [types.TextContent(type="text", text="❌ Error: customer_id is required")]
-            
-            customer = await bc_client.get_customer_by_id(customer_id)
-            if not customer:
-                return [types.TextContent(type="text", text=f"❌ Customer not found: {customer_id}")]
-            
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"🏢 **Customer Details**\n\n"
-                         f"**Name:** {customer.get('displayName', 'N/A')}\n"
-                         f"**ID:** {customer.get('id', 'N/A')}\n"
-                         f"**Phone:** {customer.get('phoneNumber', 'N/A')}\n"
-                         f"**Email:** {customer.get('email', 'N/A')}\n"
-                         f"**Address:** {customer.get('address', {}).get('street', 'N/A')}, "
-                         f"{customer.get('address', {}).get('city', 'N/A')}\n"
-                         f"**Country:** {customer.get('address', {}).get('countryLetterCode', 'N/A')}\n"
-                )
-            ]
-        
-        elif name == "get_item_details":
-            item_no = arguments.get("item_no")
-            if not item_no:
-                return [types.TextContent(type="text", text="❌ Error: item_no is required")]
-            
-            item = await bc_client.get_item_by_number(item_no)
-            if not item:
-                return [types.TextContent(type="text", text=f"❌ Item not found: {item_no}")]
-            
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"📦 **Item Details**\n\n"
-                         f"**Name:** {item.get('displayName', 'N/A')}\n"
-                         f"**Number:** {item.get('number', 'N/A')}\n"
-                         f"**Price:** {item.get('unitPrice', 0)}\n"
-                         f"**Stock:** {item.get('inventory', 0)}\n"
-                         f"**Category:** {item.get('itemCategoryCode', 'N/A')}\n"
-                         f"**Unit of measure:** {item.get('baseUnitOfMeasure', 'N/A')}\n"
-                )
-            ]
+        logger.info("📞 Calling tool: %s with arguments: %s", name, arguments)
         
-        elif name == "get_currency_exchange_rates":
-            top = arguments.get("top", 20)
-            rates = await bc_client.get_currency_exchange_rates(top=top)
-            
+        handler = _DISPATCH.get(name)
+        if handler is None:
             return [
-                types.TextContent(
+                types.TextContent.model_construct(
                     type="text",
-                    text=f"💱 **Currency Exchange Rates** (Showing {len(rates)} results)\n\n" +
-                         "\n".join([
-                             f"• **{rate.get('currencyCode', 'N/A')}** - Rate: {rate.get('relationalExchangeRateAmount', rate.get('exchangeRateAmount', 'N/A'))}\n"
-                             f"  📅 Start date: {rate.get('startingDate', 'N/A')}\n"
-                             for rate in rates
-                         ])
+                    text=f"❌ Unknown tool: {name}"
                 )
             ]
         
-        else:
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"❌ Unknown tool: {name}"
+        validate = _VALIDATORS.get(name)
+        if validate is not None:
+            try:
+                validate(arguments)
+            except fastjsonschema.JsonSchemaException as e:
+                # Same error result the SDK's own validation produces (isError=True)
+                return types.CallToolResult(
+                    content=[
+                        types.TextContent.model_construct(
+                            type="text",
+                            text=f"Input validation error: {e.message}"
+                        )
+                    ],
+                    isError=True
                 )
-            ]
+        return await handler(arguments)
     
     except Exception as e:
-        logger.error(f"Error executing {name}: {e}", exc_info=True)
+        logger.error("Error executing %s: %s", name, e, exc_info=True)
         return [
-            types.TextContent(
+            types.TextContent.model_construct(
                 type="text",
                 text=f"❌ Error executing {name}: {str(e)}"
             )
@@ -267,41 +371,10 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
 @mcp_server.list_prompts()
 async def handle_list_prompts() -> list[types.Prompt]:
     """📝 List all available prompts"""
-    return [
-        types.Prompt(
-            name="customer_analysis",
-            description="🏢 Detailed customer analysis with Business Central insights",
-            arguments=[
-                types.PromptArgument(
-                    name="customer_id",
-                    description="Customer ID to analyze",
-                    required=True
-                )
-            ]
-        ),
-        types.Prompt(
-            name="vendor_analysis",
-            description="🏭 Detailed vendor analysis",
-            arguments=[
-                types.PromptArgument(
-                    name="vendor_id",
-                    description="Vendor ID to analyze",
-                    required=True
-                )
-            ]
-        )
-    ]
+    return _PROMPTS
 
-@mcp_server.get_prompt()
-async def handle_get_prompt(name: str, arguments: dict | None) -> types.GetPromptResult:
-    """🎯 Get a specific prompt with its messages"""
-    
-    if arguments is None:
-        arguments = {}
-    
-    if name == "customer_analysis":
-        customer_id = arguments.get("customer_id", "")
-        message_text = f"""Analyze customer {customer_id} from Business Central:
+# Prompt templates (%-formatted with the prompt's single argument)
+_CUSTOMER_TMPL = """Analyze customer %s from Business Central:
 
 1. Use the get_customer_details tool to retrieve customer information
 2. Analyze the customer's purchase history and patterns  
@@ -309,10 +382,8 @@ async def handle_get_prompt(name: str, arguments: dict | None) -> types.GetPromp
 4. Provide actionable insights for account management
 
 Focus on data-driven insights and specific recommendations."""
-        
-    elif name == "vendor_analysis":
-        vendor_id = arguments.get("vendor_id", "")
-        message_text = f"""Analyze vendor {vendor_id} from Business Central:
+
+_VENDOR_TMPL = """Analyze vendor %s from Business Central:
 
 1. Use the get_vendor_details tool to retrieve vendor information
 2. Analyze the vendor's performance and reliability
@@ -320,16 +391,35 @@ Focus on data-driven insights and specific recommendations."""
 4. Provide actionable insights for procurement optimization
 
 Focus on data-driven insights and specific recommendations."""
-        
+
+_UNKNOWN_PROMPT_TMPL = "Prompt '%s' is not available."
+
+# Prompt name -> (argument name, template)
+_PROMPT_TEMPLATES: dict[str, tuple[str, str]] = {
+    "customer_analysis": ("customer_id", _CUSTOMER_TMPL),
+    "vendor_analysis": ("vendor_id", _VENDOR_TMPL),
+}
+
+@mcp_server.get_prompt()
+async def handle_get_prompt(name: str, arguments: dict | None) -> types.GetPromptResult:
+    """🎯 Get a specific prompt with its messages"""
+    
+    if arguments is None:
+        arguments = {}
+    
+    template = _PROMPT_TEMPLATES.get(name)
+    if template is not None:
+        arg_name, text = template
+        message_text = text % arguments.get(arg_name, "")
     else:
-        message_text = f"Prompt '{name}' is not available."
+        message_text = _UNKNOWN_PROMPT_TMPL % name
     
-    return types.GetPromptResult(
+    return types.GetPromptResult.model_construct(
         description=f"Prompt for {name}",
         messages=[
-            types.PromptMessage(
+            types.PromptMessage.model_construct(
                 role="user",
-                content=types.TextContent(
+                content=types.TextContent.model_construct(
                     type="text",
                     text=message_text
                 )
@@ -340,52 +430,46 @@ Focus on data-driven insights and specific recommendations."""
 @mcp_server.list_resources()
 async def handle_list_resources() -> list[types.Resource]:
     """📂 List available resources (data files)"""
-    return [
-        types.Resource(
-            uri=AnyUrl("file://data/customers.csv"),
-            name="Customer Data",
-            description="📊 Customer data in CSV format",
-            mimeType="text/csv"
-        ),
-        types.Resource(
-            uri=AnyUrl("file://data/items.csv"),
-            name="Item Data",
-            description="📦 Item/product data in CSV format",
-            mimeType="text/csv"
-        ),
-        types.Resource(
-            uri=AnyUrl("file://data/prices.csv"),
-            name="Item Prices",
-            description="💰 Item price data in CSV format",
-            mimeType="text/csv"
-        ),
-        types.Resource(
-            uri=AnyUrl("file://data/vendors.csv"),
-            name="Vendor Data",
-            description="🏭 Vendor data in CSV format",
-            mimeType="text/csv"
-        )
-    ]
+    return _RESOURCES
+
+# Files larger than this are read directly instead of being kept in memory
+_RESOURCE_CACHE_MAX_BYTES = 10 * 1024 * 1024
+
+@functools.lru_cache(maxsize=16)
+def _read_cached(file_path: Path, mtime_ns: int, size: int) -> str:
+    """Read a resource file; mtime/size are part of the key so edits invalidate it."""
+    return file_path.read_text(encoding='utf-8')
+
+# Resource URI -> local file, resolved once from the static catalog
+_RESOURCE_PATHS: dict[str, Path] = {
+    str(resource.uri): Path(str(resource.uri).replace("file://", ""))
+    for resource in _RESOURCES
+}
 
 @mcp_server.read_resource()
 async def handle_read_resource(uri: AnyUrl) -> str:
     """📖 Read a specific resource"""
-    from pathlib import Path
-    
-    # Extract path from URI
-    path_str = str(uri).replace("file://", "")
-    file_path = Path(path_str)
+    # Only resources from the catalog can be read
+    file_path = _RESOURCE_PATHS.get(str(uri))
+    if file_path is None:
+        path_str = str(uri).replace("file://", "")
+        logger.warning("⚠️ Resource not found: %s", path_str)
+        return f"Resource not found: {path_str}"
     
     try:
-        if file_path.exists():
-            content = file_path.read_text(encoding='utf-8')
-            logger.info(f"📄 Read resource: {path_str}")
-            return content
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            logger.warning("⚠️ Resource not found: %s", file_path)
+            return f"Resource not found: {file_path}"
+        if st.st_size <= _RESOURCE_CACHE_MAX_BYTES:
+            content = _read_cached(file_path, st.st_mtime_ns, st.st_size)
         else:
-            logger.warning(f"⚠️ Resource not found: {path_str}")
-            return f"Resource not found: {path_str}"
+            content = file_path.read_text(encoding='utf-8')
+        logger.info("📄 Read resource: %s", file_path)
+        return content
     except Exception as e:
-        logger.error(f"❌ Error reading resource {path_str}: {e}")
+        logger.error("❌ Error reading resource %s: %s", file_path, e)
         return f"Error reading resource: {str(e)}"
 
 async def main():
@@ -394,12 +478,17 @@ async def main():
     logger.info("[READY] Ready for Claude Desktop connection")
     
     # Run the server with STDIO transport
-    async with stdio_server() as (read_stream, write_stream):
-        await mcp_server.run(
-            read_stream,
-            write_stream,
-            mcp_server.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await mcp_server.run(
+                read_stream,
+                write_stream,
+                mcp_server.create_initialization_options()
+            )
+    finally:
+        # Release pooled HTTP connections
+        await close_bc_client()
+        await token_manager.aclose()
 
 if __name__ == "__main__":
     try:
@@ -407,6 +496,6 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("[STOP] Server stopped by user")
     except Exception as e:
-        logger.error(f"[ERROR] Server error: {e}", exc_info=True)
+        logger.error("[ERROR] Server error: %s", e, exc_info=True)
         sys.exit(1)
 
@@ -18,11 +18,29 @@ References:
 # IMPORTS AND DEPENDENCIES
 # =============================
 import asyncio
+import logging
+import time
+import urllib.parse
 import httpx
-from datetime import datetime, timedelta
 from typing import Optional
 from config import config
 
+# Fast JSON decoding when orjson is installed (stdlib fallback)
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Log to the root handler (stderr); never print, stdout carries STDIO JSON-RPC frames
+logger = logging.getLogger("azure_auth")
+
 
 # =============================
 # MAIN TOKEN MANAGEMENT CLASS
@@ -31,20 +49,75 @@ class AzureTokenManager:
     def __init__(self):
         # Current token and expiration
         self._token: Optional[str] = None
-        self._expires: Optional[datetime] = None
+        self._expires: float = 0.0  # time.monotonic() deadline
         # Access scope for Business Central
         self._scope = "https://api.businesscentral.dynamics.com/.default"
+        # Shared HTTP client (keep-alive pool reused across token renewals)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_lock = asyncio.Lock()
+        # Single-flight refresh: one caller fetches, concurrent callers await the same task
+        self._lock = asyncio.Lock()
+        self._inflight: Optional[asyncio.Task] = None
+        self.reset_config()
+
+
+    # =============================
+    # CONFIGURATION SNAPSHOT
+    # =============================
+    def reset_config(self) -> None:
+        """
+        Re-reads Azure AD credentials from config.
+        Config is read once at startup; call this if credentials change at runtime.
+        """
+        self._configured = bool(
+            config.azure_ad.client_id and config.azure_ad.client_secret and config.azure_ad.tenant_id
+        )
+        # URL-encoded token request body, built once
+        self._encoded_body: Optional[bytes] = None
+        if config.azure_ad.client_id:
+            self._encoded_body = urllib.parse.urlencode({
+                "grant_type":    "client_credentials",
+                "client_id":     config.azure_ad.client_id,
+                "client_secret": config.azure_ad.client_secret,
+                "scope":         self._scope
+            }).encode()
+
+    @property
+    def configured(self) -> bool:
+        """True when all Azure AD credentials are set (False means mock data mode)."""
+        return self._configured
+
+
+    # =============================
+    # PRIVATE METHOD: Shared HTTP client
+    # =============================
+    async def _client(self) -> httpx.AsyncClient:
+        """
+        Returns the shared httpx.AsyncClient, creating it on first use.
+        Reusing the client keeps the TCP/TLS connection to Azure AD alive between renewals.
+        """
+        if self._http is None:
+            async with self._http_lock:
+                if self._http is None:
+                    self._http = httpx.AsyncClient(
+                        timeout=30.0,
+                        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=300),
+                        http2=HTTP2_AVAILABLE
+                    )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Closes the shared HTTP client (call at shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
 
     # =============================
     # PRIVATE METHOD: Token valid?
     # =============================
     def _valid(self) -> bool:
-        return (
-            self._token is not None
-            and self._expires is not None
-            and datetime.utcnow() < self._expires
-        )
+        return self._token is not None and time.monotonic() < self._expires
 
 
     # =============================
@@ -56,12 +129,34 @@ class AzureTokenManager:
         Returns None if Azure AD credentials are not configured.
         """
         # Check if we have Azure AD credentials configured
-        if not config.azure_ad.client_id or not config.azure_ad.client_secret or not config.azure_ad.tenant_id:
+        if not self._configured:
             return None
         
         if self._valid():
             return self._token
-        return await self._fetch()
+        # Another coroutine is already renewing: reuse its result
+        # (shielded, so a cancelled waiter doesn't cancel the shared fetch for everyone else)
+        if self._inflight is not None:
+            return await asyncio.shield(self._inflight)
+        async with self._lock:
+            # Re-check after acquiring the lock (renewed while we waited)
+            if self._valid():
+                return self._token
+            self._inflight = asyncio.create_task(self._fetch())
+            try:
+                return await asyncio.shield(self._inflight)
+            finally:
+                self._inflight = None
+
+    async def get_token_with_ttl(self) -> tuple[Optional[str], float]:
+        """
+        Returns (token, seconds until the token should be renewed).
+        The TTL already includes the 5-minute refresh margin; it is 0 when no token is available.
+        """
+        token = await self.get_token()
+        if token is None:
+            return None, 0.0
+        return token, max(self._expires - time.monotonic(), 0.0)
 
 
     # =============================
@@ -69,21 +164,16 @@ class AzureTokenManager:
     # =============================
     async def _fetch(self) -> Optional[str]:
         url = f"{config.azure_ad.authority}/oauth2/v2.0/token"
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": config.azure_ad.client_id,
-            "client_secret": config.azure_ad.client_secret,
-            "scope": self._scope
-        }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        async with httpx.AsyncClient() as cli:
-            resp = await cli.post(url, data=data, headers=headers, timeout=30)
+        client = await self._client()
+        resp = await client.post(url, content=self._encoded_body, headers=headers)
         if resp.status_code == 200:
-            j = resp.json()
+            j = json_loads(resp.content)
             self._token = j["access_token"]
-            self._expires = datetime.utcnow() + timedelta(seconds=j.get("expires_in", 3600))
+            # Refresh 5 minutes before Azure's hard expiry to avoid mid-request 401s
+            self._expires = time.monotonic() + int(j.get("expires_in", 3600)) - 300
             return self._token
-        print(f"[ERROR] Azure AD Token: {resp.status_code}")
+        logger.error("Azure AD token: %s %s", resp.status_code, resp.text)
         return None
 
 
@@ -95,37 +185,28 @@ class AzureTokenManager:
         Acquires a new token from Azure AD using a URL-encoded body (useful for advanced debugging).
         """
         token_url = f"{config.azure_ad.authority}/oauth2/v2.0/token"
-        # Build the body as URL-encoded
-        form = {
-            "grant_type":    "client_credentials",
-            "client_id":     config.azure_ad.client_id,
-            "client_secret": config.azure_ad.client_secret,
-            "scope":         self._scope
-        }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # USE content= and urllib.parse.urlencode to simulate Postman exactly
-                import urllib.parse
-                payload = urllib.parse.urlencode(form)
-                response = await client.post(
-                    token_url,
-                    content=payload,
-                    headers=headers
-                )
-                # DEBUG: if it fails, see full body
-                if response.status_code != 200:
-                    print(f"[DEBUG] Token request failed ({response.status_code}): {response.text}")
-                    return None
-                data = response.json()
-                access_token = data["access_token"]
-                expires_in   = data.get("expires_in", 3600)
-                # cache
-                self._token_cache   = access_token
-                self._token_expires = datetime.now() + timedelta(seconds=expires_in - 300)
-                return access_token
+            client = await self._client()
+            # USE content= with the pre-encoded body to simulate Postman exactly
+            response = await client.post(
+                token_url,
+                content=self._encoded_body,
+                headers=headers
+            )
+            # DEBUG: if it fails, see full body
+            if response.status_code != 200:
+                logger.debug("Token request failed (%s): %s", response.status_code, response.text)
+                return None
+            data = json_loads(response.content)
+            access_token = data["access_token"]
+            expires_in   = data.get("expires_in", 3600)
+            # cache
+            self._token_cache   = access_token
+            self._token_expires = time.monotonic() + expires_in - 300
+            return access_token
         except Exception as e:
-            print(f"[ERROR] Exception acquiring token: {e}")
+            logger.error("Exception acquiring token: %s", e)
             return None
 
 
@@ -8,10 +8,14 @@ Main features:
   - Implements exponential retry logic and robust HTTP error handling (401, 5xx).
   - Exposes async methods for key operations:
       * get_customers(top): List customers
-      * get_customer(id): Customer detail
+      * get_customer(id): Customer detail (also available as get_customer_by_id)
       * get_items(top): List items
       * get_orders(top): List sales orders
       * create_customer(data): Create a new customer
+      * get_customers_by_ids / get_items_by_numbers / get_deliveries_by_ids: concurrent
+        by-ID batches, bounded by BC_CONCURRENCY
+  - Streaming variants for large lists (aiter_customers, aiter_items, aiter_orders,
+    aiter_deliveries) that yield rows while the response is still being parsed.
 
 Quick onboarding:
   1. Ensure the `.env` file is correctly configured (see README).
@@ -27,37 +31,82 @@ import asyncio
 import httpx
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import random
+import re
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
 from config import config
+
+# Fast JSON encoding/decoding when orjson is installed (stdlib fallback)
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    import json
+    from json import loads as json_loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Incremental JSON parsing for large list responses (optional; falls back to buffered parsing)
+try:
+    import ijson
+except ImportError:
+    ijson = None
 # Make sure azure_auth.py is in the same directory or adjust the import based on your project structure
 try:
-    from azure_auth import token_manager
+    from azure_auth import HTTP2_AVAILABLE, token_manager
 except ModuleNotFoundError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from azure_auth import token_manager
+    from azure_auth import HTTP2_AVAILABLE, token_manager
 
-# Global logging configuration
+# Logging: only configure the root logger when the application hasn't done it already
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=LOG_LEVEL,
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
-)
 logger = logging.getLogger("bc_client")
+logger.addHandler(logging.NullHandler())
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(
+        level=LOG_LEVEL,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
 
 
 class APIEndpointBuilder:
     """
     Dynamic URL builder for Business Central standard and custom APIs.
     """
+    __slots__ = (
+        "base_url", "company_id", "company_id_encoded",
+        "_standard_root", "_base_without_version", "_custom_root_cache"
+    )
+
     def __init__(self, base_url: str, company_id: str):
         self.base_url = base_url
         self.company_id = company_id
+        # Percent-encoded once; every URL embeds this form (None stays None in mock data mode)
+        self.company_id_encoded = urllib.parse.quote(company_id, safe="") if company_id else company_id
+        # Precomputed roots (base_url and company_id don't change after construction)
+        self._standard_root = f"{base_url}/companies({self.company_id_encoded})"
+        # Base up to tenant/environment, without /api/v2.0
+        self._base_without_version = (base_url or "").split('/api/v2.0', 1)[0]
+        # (publisher, app_group, version) -> custom API root
+        self._custom_root_cache: Dict[tuple, str] = {}
         
     def build_standard_url(self, endpoint: str) -> str:
         """Builds URL for standard API: /api/v2.0/companies({company})/endpoint"""
-        return f"{self.base_url}/companies({self.company_id})/{endpoint}"
+        return f"{self._standard_root}/{endpoint}"
+
+    def _custom_root(self, publisher: str, app_group: str, version: str) -> str:
+        """Returns (and caches) the custom API root: {base}/api/{publisher}/{app_group}/{version}"""
+        key = (publisher, app_group, version)
+        root = self._custom_root_cache.get(key)
+        if root is None:
+            root = f"{self._base_without_version}/api/{publisher}/{app_group}/{version}"
+            self._custom_root_cache[key] = root
+        return root
         
     def build_custom_url(self, publisher: str, app_group: str, version: str, endpoint: str, use_company: bool = False) -> str:
         """
@@ -65,56 +114,225 @@ class APIEndpointBuilder:
         Format: /api/{publisher}/{app_group}/{version}/{endpoint}
         If use_company=True: /api/{publisher}/{app_group}/{version}/companies({company})/{endpoint}
         """
-        # Extract the base up to tenant/environment, without /api/v2.0
-        base_parts = self.base_url.split('/api/v2.0')
-        base_without_version = base_parts[0]
-        custom_path = f"{base_without_version}/api/{publisher}/{app_group}/{version}"
+        custom_path = self._custom_root(publisher, app_group, version)
         
         if use_company:
-            return f"{custom_path}/companies({self.company_id})/{endpoint}"
+            return f"{custom_path}/companies({self.company_id_encoded})/{endpoint}"
         else:
             return f"{custom_path}/{endpoint}"
 
 
+# Upper bound on cached GET responses (least recently used entries are evicted first)
+_CACHE_MAX_SIZE = 512
+
+# BC entity ids (SystemId) are GUIDs; anything else is a document/item number
+_GUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+def _oesc(s: str) -> str:
+    """Escapes an OData string literal (single quotes are doubled)."""
+    return s.replace("'", "''")
+
+
+# Delivery filter key -> OData field compared with `eq` (string-valued fields)
+_DELIVERY_FILTER_FIELDS = {
+    "customer_id": "customerId",
+    "status": "status",
+}
+
+
+class ODataFilterBuilder:
+    """
+    Collects OData `$filter` clauses and joins them with 'and' once.
+    Clauses whose value is None or empty are skipped, so optional filters can be chained directly
+    (callers check required keys themselves before building):
+        ODataFilterBuilder().eq("customerId", cid).ge("deliveryDate", date_from).build()
+    """
+    __slots__ = ("_parts",)
+
+    def __init__(self):
+        self._parts: List[str] = []
+
+    def eq(self, field: str, value: Optional[str]) -> "ODataFilterBuilder":
+        """Adds `field eq 'value'` (string literal, quotes escaped)."""
+        if value is not None and value != "":
+            self._parts.append(f"{field} eq '{_oesc(value)}'")
+        return self
+
+    def ge(self, field: str, value: Optional[str]) -> "ODataFilterBuilder":
+        """Adds `field ge value` (unquoted, e.g. dates)."""
+        if value is not None and value != "":
+            self._parts.append(f"{field} ge {value}")
+        return self
+
+    def le(self, field: str, value: Optional[str]) -> "ODataFilterBuilder":
+        """Adds `field le value` (unquoted, e.g. dates)."""
+        if value is not None and value != "":
+            self._parts.append(f"{field} le {value}")
+        return self
+
+    def build(self) -> Optional[str]:
+        """Returns the combined filter expression, or None if no clause was added."""
+        return " and ".join(self._parts) if self._parts else None
+
+
+def _body_preview(resp: httpx.Response, limit: int = 200) -> str:
+    """First `limit` bytes of a response body, decoded without decoding the whole body."""
+    return resp.content[:limit].decode("utf-8", errors="replace")
+
+
+class _AsyncByteReader:
+    """Adapts an httpx streaming response to the async `read()` interface ijson expects."""
+    __slots__ = ("_chunks",)
+
+    def __init__(self, resp: httpx.Response):
+        self._chunks = resp.aiter_bytes()
+
+    async def read(self, n: int = -1) -> bytes:
+        if n == 0:  # ijson probes with read(0) to detect bytes vs str
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
 class BusinessCentralClient:
     """
     Asynchronous client for the Business Central API.
     Manages authentication, retries and exposes methods for standard and custom APIs.
     """
+    __slots__ = (
+        "base", "comp", "url_builder", "_retries", "_timeout", "_client",
+        "_cached_token", "_token_exp", "_token_lock", "_cache"
+    )
+
     def __init__(self):
         self.base = config.bc.base_url
         self.comp = config.bc.company_id
         self.url_builder = APIEndpointBuilder(self.base, self.comp)
         self._retries = 3  # Number of retries for transient errors
-        self._timeout = 30  # Global timeout for HTTP requests (seconds)
+        self._timeout = httpx.Timeout(30, connect=5)  # Global timeout for HTTP requests (seconds)
+        # Shared HTTP client (created on first request): keep-alive pool reused across all tool calls
+        self._client: Optional[httpx.AsyncClient] = None
+        # Local copy of the Azure AD token and its monotonic expiry (renewal margin already applied)
+        self._cached_token: Optional[str] = None
+        self._token_exp: float = 0.0
+        self._token_lock = asyncio.Lock()
+        # GET response cache: (url, sorted params) -> (monotonic expiry, parsed JSON)
+        self._cache: "OrderedDict[tuple, tuple[float, Any]]" = OrderedDict()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Returns the shared httpx.AsyncClient, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=config.bc.http_max_connections,
+                    max_keepalive_connections=config.bc.http_max_keepalive,
+                    keepalive_expiry=30.0
+                ),
+                http2=HTTP2_AVAILABLE,
+                base_url=self.base or ""
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Closes the shared HTTP client (call at shutdown, or use `async with`)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def invalidate_cache(self) -> None:
+        """Drops every cached GET response (next reads go to Business Central)."""
+        self._cache.clear()
+
+    async def __aenter__(self) -> "BusinessCentralClient":
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _get_token(self) -> Optional[str]:
+        """
+        Returns the cached Azure AD token, asking token_manager only when it has expired.
+        Concurrent callers wait on one lock so a single coroutine performs the refresh.
+        """
+        if self._cached_token and time.monotonic() < self._token_exp:
+            return self._cached_token
+        async with self._token_lock:
+            now = time.monotonic()
+            if not self._cached_token or now >= self._token_exp:
+                token, ttl = await token_manager.get_token_with_ttl()
+                self._cached_token, self._token_exp = token, now + ttl
+            return self._cached_token
+
+    async def _sleep_backoff(self, attempt: int) -> None:
+        """
+        Waits before retry number `attempt` (0-based) without blocking the event loop.
+        Exponential delay capped at 30 s, with +/-50% jitter so concurrent retries don't align.
+        """
+        delay = min(30.0, 0.5 * (2 ** attempt))
+        await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    async def _gather_bounded(self, coros, limit: Optional[int] = None) -> List[Any]:
+        """
+        Runs the given coroutines concurrently, at most `limit` at a time (default BC_CONCURRENCY).
+        Results keep the input order, so by-ID batches line up with the IDs requested.
+        """
+        sem = asyncio.Semaphore(limit or config.bc.concurrency)
+
+        async def _wrap(c):
+            async with sem:
+                return await c
+        return await asyncio.gather(*(_wrap(c) for c in coros))
 
     async def _request(
         self, method: str, path_or_url: str,
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
-        is_full_url: bool = False
+        is_full_url: bool = False,
+        cache: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Makes an authenticated HTTP request to the Business Central API.
         Handles automatic retries for 401/5xx errors and refreshes token if necessary.
+        GETs made with cache=True are kept for BC_CACHE_TTL seconds (the cached dict is
+        shared, so callers must not mutate it); any successful write clears the cache.
         Parameters:
             method (str): HTTP method ('GET', 'POST', etc.)
             path_or_url (str): Relative path within BC company or full URL
             params (dict): Optional query parameters
             data (dict): JSON payload for POST/PUT
             is_full_url (bool): If True, path_or_url is a full URL
+            cache (bool): If True, a GET response is served from / stored in the TTL cache
         Returns:
             Dictionary with JSON response or None if it fails.
         """
+        # Mock data mode: no Azure AD credentials, so no request can ever be authenticated
+        if not token_manager.configured:
+            logger.debug("BC mock mode: skipping %s %s", method, path_or_url)
+            return None
         if is_full_url:
             url = path_or_url
         else:
             url = self.url_builder.build_standard_url(path_or_url)
+        key = None
+        if cache and method == "GET" and config.bc.cache_ttl > 0:
+            key = (url, tuple(sorted(params.items())) if params else ())
+            hit = self._cache.get(key)
+            if hit is not None:
+                if time.monotonic() < hit[0]:
+                    self._cache.move_to_end(key)
+                    return hit[1]
+                del self._cache[key]
+        # Serialize the payload once for all retries
+        content = json_dumps(data) if data is not None else None
             
         resp = None
         for i in range(self._retries):
-            logger.debug(f"BC Request #{i+1}: {method} {url} params={params} data={data}")
-            token = await token_manager.get_token()
+            logger.debug("BC Request #%d: %s %s params=%s data=%s", i + 1, method, url, params, data)
+            token = await self._get_token()
             if not token:
                 logger.warning("Azure AD credentials not configured. Cannot connect to Business Central API. Running in mock data mode.")
                 return None
@@ -122,32 +340,80 @@ class BusinessCentralClient:
                 "Authorization": f"Bearer {token}",
                 "Accept": "application/json"
             }
-            async with httpx.AsyncClient(timeout=self._timeout) as cli:
-                resp = await cli.request(method, url, headers=headers, params=params, json=data)
-            # DEBUG: show response
-            logger.debug(f"BC Response {resp.status_code}: {resp.text[:200]}")
+            if content is not None:
+                headers["Content-Type"] = "application/json"
+            cli = await self._get_client()
+            resp = await cli.request(method, url, headers=headers, params=params, content=content)
+            # DEBUG: show response (only decode the body preview when debug logging is on)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("BC Response %s: %s", resp.status_code, _body_preview(resp))
             if resp.status_code in (200, 201, 204):
+                if method != "GET":
+                    self._cache.clear()  # a write may have changed any cached read
                 if resp.status_code == 204:  # No Content
                     return {"success": True}
                 try:
-                    return resp.json()
+                    result = json_loads(resp.content)
                 except ValueError:
                     return {"success": True, "raw_response": resp.text}
+                if key is not None:
+                    self._cache[key] = (time.monotonic() + config.bc.cache_ttl, result)
+                    if len(self._cache) > _CACHE_MAX_SIZE:
+                        self._cache.popitem(last=False)
+                return result
             if resp.status_code == 401:
                 token_manager._token = None
+                self._token_exp = 0.0
                 logger.warning("Token expired or invalid. Retrying...")
                 continue
             if resp.status_code >= 500:
-                logger.warning(f"Error {resp.status_code} in Business Central. Retrying...")
-                await asyncio.sleep(2 ** i)
+                logger.warning("Error %s in Business Central. Retrying...", resp.status_code)
+                await self._sleep_backoff(i)
                 continue
             break
         if resp is not None:
-            logger.error(f"BC API {method} {path_or_url}: {resp.status_code} - {resp.text[:200]}")
+            logger.error("BC API %s %s: %s - %s", method, path_or_url, resp.status_code, _body_preview(resp))
         else:
-            logger.error(f"BC API {method} {path_or_url}: No response received from server.")
+            logger.error("BC API %s %s: No response received from server.", method, path_or_url)
         return None
 
+    async def _request_stream(
+        self, method: str, path_or_url: str,
+        params: Optional[Dict] = None,
+        is_full_url: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Makes an authenticated list request and yields the rows of the OData `value` array
+        as they are parsed from the response stream (the raw body is never held whole).
+        Parameters:
+            method (str): HTTP method (normally 'GET')
+            path_or_url (str): Relative path within BC company or full URL
+            params (dict): Optional query parameters
+            is_full_url (bool): If True, path_or_url is a full URL
+        Yields:
+            One dictionary per row.
+        Notes:
+            - Without ijson installed, or on any non-200 response, falls back to `_request`
+              (buffered parsing with its retry handling).
+        """
+        if ijson is not None:
+            url = path_or_url if is_full_url else self.url_builder.build_standard_url(path_or_url)
+            token = await self._get_token()
+            if token:
+                headers = {
+                    "Authorization": f"Bearer {token}",
+                    "Accept": "application/json"
+                }
+                cli = await self._get_client()
+                async with cli.stream(method, url, headers=headers, params=params) as resp:
+                    if resp.status_code == 200:
+                        async for row in ijson.items_async(_AsyncByteReader(resp), "value.item", use_float=True):
+                            yield row
+                        return
+        res = await self._request(method, path_or_url, params=params, is_full_url=is_full_url)
+        for row in (res.get("value", []) if res else []):
+            yield row
+
 
     async def get_customers(self, top: int = 20) -> List[Dict]:
         """
@@ -159,11 +425,20 @@ class BusinessCentralClient:
         """
         res = await self._request("GET", "customers", params={"$top": top})
         if res:
-            logger.info(f"Customers retrieved: {len(res.get('value', []))}")
+            logger.info("Customers retrieved: %d", len(res.get('value', [])))
         else:
             logger.error("Could not retrieve customer list.")
         return res.get("value", []) if res else []
 
+    async def aiter_customers(self, top: int = 20) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of get_customers: yields customers as they are parsed.
+        Parameters:
+            top (int): Maximum number of customers to return (default 20).
+        """
+        async for row in self._request_stream("GET", "customers", params={"$top": top}):
+            yield row
+
 
     async def get_customer(self, cid: str) -> Optional[Dict]:
         """
@@ -175,16 +450,19 @@ class BusinessCentralClient:
         """
         return await self._request("GET", f"customers({cid})")
 
-    async def get_customer_by_id(self, customer_id: str) -> Optional[Dict]:
+    # get_customer_by_id is the same function as get_customer (no extra coroutine per call);
+    # both names are kept for existing callers
+    get_customer_by_id = get_customer
+
+    async def get_customers_by_ids(self, ids: List[str]) -> List[Optional[Dict]]:
         """
-        Gets the detail of a customer by their ID (alias for get_customer).
+        Gets several customers by ID concurrently (bounded by BC_CONCURRENCY).
         Parameters:
-            customer_id (str): Customer's unique ID in BC.
+            ids (List[str]): Customer IDs in BC.
         Returns:
-            Dictionary with customer data or None if doesn't exist.
+            List with one entry per ID, in the same order (None where the customer doesn't exist).
         """
-        return await self.get_customer(customer_id)
-
+        return await self._gather_bounded(self.get_customer(i) for i in ids)
 
     async def get_items(self, top: int = 20) -> List[Dict]:
         """
@@ -194,9 +472,18 @@ class BusinessCentralClient:
         Returns:
             List of dictionaries with items.
         """
-        res = await self._request("GET", "items", params={"$top": top})
+        res = await self._request("GET", "items", params={"$top": top}, cache=True)
         return res.get("value", []) if res else []
 
+    async def aiter_items(self, top: int = 20) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of get_items: yields items as they are parsed.
+        Parameters:
+            top (int): Maximum number of items to return (default 20).
+        """
+        async for row in self._request_stream("GET", "items", params={"$top": top}):
+            yield row
+
     async def get_item_by_number(self, item_no: str) -> Optional[Dict]:
         """
         Gets the detail of an item by its number.
@@ -205,17 +492,30 @@ class BusinessCentralClient:
         Returns:
             Dictionary with item data or None if doesn't exist.
         """
-        # Try direct access first
-        result = await self._request("GET", f"items({item_no})")
-        if result:
-            return result
-        
-        # If it fails, try with filter
-        res = await self._request("GET", "items", params={"$filter": f"number eq '{item_no}'", "$top": 1})
+        # The number is a required key (the filter builder would drop an empty value)
+        if not item_no:
+            return None
+        # Direct access only works with the item GUID; item numbers go straight to the filter
+        if _GUID_RE.fullmatch(item_no):
+            result = await self._request("GET", f"items({item_no})")
+            if result:
+                return result
+
+        res = await self._request("GET", "items", params={"$filter": ODataFilterBuilder().eq("number", item_no).build(), "$top": 1})
         if res and 'value' in res and res['value']:
             return res['value'][0]
         return None
 
+    async def get_items_by_numbers(self, item_nos: List[str]) -> List[Optional[Dict]]:
+        """
+        Gets several items by number concurrently (bounded by BC_CONCURRENCY).
+        Parameters:
+            item_nos (List[str]): Item numbers (or IDs) in BC.
+        Returns:
+            List with one entry per number, in the same order (None where the item doesn't exist).
+        """
+        return await self._gather_bounded(self.get_item_by_number(n) for n in item_nos)
+
 
     async def get_orders(self, top: int = 10) -> List[Dict]:
         """
@@ -228,6 +528,15 @@ class BusinessCentralClient:
         res = await self._request("GET", "salesOrders", params={"$top": top})
         return res.get("value", []) if res else []
 
+    async def aiter_orders(self, top: int = 10) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of get_orders: yields sales orders as they are parsed.
+        Parameters:
+            top (int): Maximum number of orders to return (default 10).
+        """
+        async for row in self._request_stream("GET", "salesOrders", params={"$top": top}):
+            yield row
+
     async def get_sales_orders(self, filter_query: str = "", top: int = 20) -> List[Dict]:
         """
         Lists sales orders from Business Central with filters.
@@ -266,10 +575,11 @@ class BusinessCentralClient:
             List of dictionaries with exchange rates.
         """
         params = {"$top": top}
-        if currency_code:
-            params["$filter"] = f"currencyCode eq '{currency_code}'"
+        filter_expr = ODataFilterBuilder().eq("currencyCode", currency_code).build()
+        if filter_expr:
+            params["$filter"] = filter_expr
         
-        res = await self._request("GET", "currencyExchangeRates", params=params)
+        res = await self._request("GET", "currencyExchangeRates", params=params, cache=True)
         return res.get("value", []) if res else []
 
     # ========================================================================
@@ -288,6 +598,18 @@ class BusinessCentralClient:
     Important to document and explain this additional point in the step-by-step guide
     """
 
+    def _delivery_params(self, filters: Optional[Dict], top: int) -> Dict[str, Any]:
+        """Builds the OData query parameters shared by get_deliveries and aiter_deliveries."""
+        params = {"$top": top}
+        if filters:
+            builder = ODataFilterBuilder()
+            for key, field in _DELIVERY_FILTER_FIELDS.items():
+                builder.eq(field, filters.get(key))
+            filter_expr = builder.ge("deliveryDate", filters.get("date_from")).le("deliveryDate", filters.get("date_to")).build()
+            if filter_expr:
+                params["$filter"] = filter_expr
+        return params
+
     async def get_deliveries(self, filters: Optional[Dict] = None, top: int = 20) -> List[Dict]:
         """
         Gets deliveries from TechSphereDynamics custom API.
@@ -297,32 +619,7 @@ class BusinessCentralClient:
         Returns:
             List of dictionaries with deliveries
         """
-        params = {"$top": top}
-        if filters:
-            if filters.get("customer_id"):
-                params["$filter"] = f"customerId eq '{filters['customer_id']}'"
-            if filters.get("status"):
-                filter_expr = params.get("$filter", "")
-                if filter_expr:
-                    filter_expr += f" and status eq '{filters['status']}'"
-                else:
-                    filter_expr = f"status eq '{filters['status']}'"
-                params["$filter"] = filter_expr
-            if filters.get("date_from") or filters.get("date_to"):
-                date_filter = []
-                if filters.get("date_from"):
-                    date_filter.append(f"deliveryDate ge {filters['date_from']}")
-                if filters.get("date_to"):
-                    date_filter.append(f"deliveryDate le {filters['date_to']}")
-                if date_filter:
-                    filter_expr = params.get("$filter", "")
-                    date_expr = " and ".join(date_filter)
-                    if filter_expr:
-                        filter_expr += f" and ({date_expr})"
-                    else:
-                        filter_expr = date_expr
-                    params["$filter"] = filter_expr
-
+        params = self._delivery_params(filters, top)
         url = self.url_builder.build_custom_url(
             publisher="techSphereDynamics", 
             app_group="delivery", 
@@ -333,6 +630,24 @@ class BusinessCentralClient:
         res = await self._request("GET", url, params=params, is_full_url=True)
         return res.get("value", []) if res else []
 
+    async def aiter_deliveries(self, filters: Optional[Dict] = None, top: int = 20) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of get_deliveries: yields deliveries as they are parsed.
+        Parameters:
+            filters (dict): Optional filters (customer_id, status, date_from, date_to)
+            top (int): Maximum number of deliveries to return
+        """
+        params = self._delivery_params(filters, top)
+        url = self.url_builder.build_custom_url(
+            publisher="techSphereDynamics",
+            app_group="delivery",
+            version="v1.0",
+            endpoint="deliveries",
+            use_company=True
+        )
+        async for row in self._request_stream("GET", url, params=params, is_full_url=True):
+            yield row
+
     async def get_delivery(self, delivery_id: str) -> Optional[Dict]:
         """
         Gets the detail of a specific delivery.
@@ -341,8 +656,11 @@ class BusinessCentralClient:
         Returns:
             Dictionary with delivery data or None if doesn't exist
         """
-        # If delivery_id looks like a GUID, use direct access WITHOUT quotes
-        if len(delivery_id) > 20 and '-' in delivery_id:
+        # The ID is a required key (the filter builder would drop an empty value)
+        if not delivery_id:
+            return None
+        # If delivery_id is a GUID, use direct access WITHOUT quotes
+        if _GUID_RE.fullmatch(delivery_id):
             # It's a GUID (id field), use direct access WITHOUT quotes
             url = self.url_builder.build_custom_url(
                 publisher="techSphereDynamics",
@@ -361,12 +679,22 @@ class BusinessCentralClient:
                 endpoint="deliveries",
                 use_company=True
             )
-            params = {"$filter": f"no eq '{delivery_id}'", "$top": 1}
+            params = {"$filter": ODataFilterBuilder().eq("no", delivery_id).build(), "$top": 1}
             response = await self._request("GET", url, params=params, is_full_url=True)
             if response and 'value' in response and response['value']:
                 return response['value'][0]
             return None
 
+    async def get_deliveries_by_ids(self, delivery_ids: List[str]) -> List[Optional[Dict]]:
+        """
+        Gets several deliveries concurrently (bounded by BC_CONCURRENCY).
+        Parameters:
+            delivery_ids (List[str]): Delivery IDs (GUID or No.)
+        Returns:
+            List with one entry per ID, in the same order (None where the delivery doesn't exist)
+        """
+        return await self._gather_bounded(self.get_delivery(d) for d in delivery_ids)
+
     async def update_delivery_status(self, delivery_id: str, status: str, notes: str = "") -> Optional[Dict]:
         """
         Updates the status of a delivery.
@@ -403,11 +731,16 @@ class BusinessCentralClient:
         Returns:
             List of delivery routes
         """
+        # Both dates are required: without them the range filter would be empty (BC rejected it before)
+        if not date_from or not date_to:
+            return []
         params = {
-            "$filter": f"routeDate ge {date_from} and routeDate le {date_to}"
+            "$filter": ODataFilterBuilder()
+                .ge("routeDate", date_from)
+                .le("routeDate", date_to)
+                .eq("driverId", driver_id)
+                .build()
         }
-        if driver_id:
-            params["$filter"] += f" and driverId eq '{driver_id}'"
             
         url = self.url_builder.build_custom_url(
             publisher="techSphereDynamics",
@@ -445,8 +778,9 @@ class BusinessCentralClient:
             List with inventory status
         """
         params = {}
-        if warehouse_id:
-            params["$filter"] = f"warehouseId eq '{warehouse_id}'"
+        filter_expr = ODataFilterBuilder().eq("warehouseId", warehouse_id).build()
+        if filter_expr:
+            params["$filter"] = filter_expr
             
         url = self.url_builder.build_custom_url(
             publisher="techSphereDynamics",
@@ -455,9 +789,60 @@ class BusinessCentralClient:
             endpoint="inventory",
             use_company=True
         )
-        res = await self._request("GET", url, params=params, is_full_url=True)
+        res = await self._request("GET", url, params=params, is_full_url=True, cache=True)
         return res.get("value", []) if res else []
 
-
-# Shared instance for global use
-bc_client = BusinessCentralClient()
+    async def get_delivery_dashboard(self, date_from: str, date_to: str, filters: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Gets deliveries, delivery routes and inventory status concurrently (one round-trip of wall time).
+        Parameters:
+            date_from (str): Start date for routes in YYYY-MM-DD format
+            date_to (str): End date for routes in YYYY-MM-DD format
+            filters (dict): Optional delivery filters (customer_id, status, date_from, date_to)
+        Returns:
+            Dictionary with 'deliveries', 'routes' and 'inventory' lists, plus 'errors'
+        Notes:
+            - Uses asyncio.gather(return_exceptions=True): if one call fails, its section is an
+              empty list and the error message is reported under 'errors', the others are kept.
+        """
+        results = await asyncio.gather(
+            self.get_deliveries(filters),
+            self.get_delivery_routes(date_from, date_to),
+            self.get_inventory_status(),
+            return_exceptions=True
+        )
+        dashboard: Dict[str, Any] = {"errors": {}}
+        for key, result in zip(("deliveries", "routes", "inventory"), results):
+            if isinstance(result, Exception):
+                logger.error("Delivery dashboard: %s failed: %s", key, result)
+                dashboard[key] = []
+                dashboard["errors"][key] = str(result)
+            else:
+                dashboard[key] = result
+        return dashboard
+
+
+# Shared instance for global use, created on first `await get_bc_client()` (not at import).
+# Call `await close_bc_client()` at shutdown to release its HTTP connection pool.
+_bc_client: Optional[BusinessCentralClient] = None
+_bc_lock = asyncio.Lock()
+
+
+async def get_bc_client() -> BusinessCentralClient:
+    """Returns the shared BusinessCentralClient, creating it (and its connection pool) on first use."""
+    global _bc_client
+    if _bc_client is None:
+        async with _bc_lock:
+            if _bc_client is None:
+                bc = BusinessCentralClient()
+                await bc._get_client()  # warm up the pool inside the running event loop
+                _bc_client = bc
+    return _bc_client
+
+
+async def close_bc_client() -> None:
+    """Closes the shared client if it was ever created."""
+    global _bc_client
+    if _bc_client is not None:
+        await _bc_client.aclose()
+        _bc_client = None
@@ -28,18 +28,30 @@ from dotenv import load_dotenv, find_dotenv
 from typing import Optional
 from pydantic import BaseModel, Field, model_validator
 
-# Load .env automatically if it exists, even during Uvicorn reload processes
-env_path = find_dotenv()
-if env_path:
-    load_dotenv(env_path, override=True)
-
-# Global logging configuration (if not already configured)
+# Config models are validated from JSON so pydantic-core parses them end-to-end in Rust
+try:
+    from orjson import dumps as json_dumps
+except ImportError:
+    from json import dumps as json_dumps
+
+# Load .env automatically if it exists, once per process tree.
+# Reload workers inherit the marker (and the loaded variables) and skip the directory walk.
+_DOTENV_PATH: Optional[str] = None
+if not os.environ.get("_BC_DOTENV_LOADED"):
+    _DOTENV_PATH = find_dotenv()
+    if _DOTENV_PATH:
+        load_dotenv(_DOTENV_PATH, override=True)
+    os.environ["_BC_DOTENV_LOADED"] = "1"
+
+# Logging: only configure the root logger when the application hasn't done it already
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=LOG_LEVEL,
-    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
-)
 logger = logging.getLogger("config")
+logger.addHandler(logging.NullHandler())
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(
+        level=LOG_LEVEL,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
 
 
 class AzureADConfig(BaseModel):
@@ -71,6 +83,10 @@ class BusinessCentralConfig(BaseModel):
     company_id: Optional[str] = Field(default=None, description="Business Central Company ID")
     tenant_id: Optional[str] = Field(default=None, description="Azure AD Tenant ID for BC API path")
     base_url: Optional[str] = None
+    http_max_connections: int = Field(default=1000, gt=0, description="Max concurrent HTTP connections to BC")
+    http_max_keepalive: int = Field(default=100, ge=0, description="Max idle keep-alive connections to BC")
+    concurrency: int = Field(default=10, gt=0, description="Max concurrent requests in by-ID batch fetches")
+    cache_ttl: float = Field(default=30.0, ge=0, description="Seconds a GET response stays cached (0 disables)")
 
     @model_validator(mode="after")
     def set_base_url(self):
@@ -109,10 +125,10 @@ class AppConfig:
                 ("AZURE_CLIENT_SECRET", s),
             ) if not val]
             logger.warning(f"Azure AD credentials not configured: {', '.join(missing)}. Running in mock data mode.")
-            return AzureADConfig(tenant_id=t, client_id=c, client_secret=s)
+            return AzureADConfig.model_validate_json(json_dumps({"tenant_id": t, "client_id": c, "client_secret": s}))
         
         # All credentials are present
-        return AzureADConfig(tenant_id=t, client_id=c, client_secret=s)
+        return AzureADConfig.model_validate_json(json_dumps({"tenant_id": t, "client_id": c, "client_secret": s}))
 
     def _load_bc(self) -> BusinessCentralConfig:
         """
@@ -131,7 +147,19 @@ class AppConfig:
         if not cid:
             logger.warning("BC_COMPANY_ID not configured. Running in mock data mode.")
         
-        bc = BusinessCentralConfig(environment=env, company_id=cid, tenant_id=tenant, base_url=base_url)
+        # HTTP connection pool tuning (optional)
+        max_conn = os.getenv("BC_HTTP_MAX_CONN", "1000")
+        max_keepalive = os.getenv("BC_HTTP_MAX_KEEPALIVE", "100")
+        # Batch fetch concurrency, tune to the BC throttling budget (optional)
+        concurrency = os.getenv("BC_CONCURRENCY", "10")
+        # GET response cache lifetime in seconds, 0 disables it (optional)
+        cache_ttl = os.getenv("BC_CACHE_TTL", "30")
+
+        bc = BusinessCentralConfig.model_validate_json(json_dumps({
+            "environment": env, "company_id": cid, "tenant_id": tenant, "base_url": base_url,
+            "http_max_connections": max_conn, "http_max_keepalive": max_keepalive,
+            "concurrency": concurrency, "cache_ttl": cache_ttl
+        }))
         return bc
 
     def validate(self) -> bool:
@@ -7,127 +7,183 @@ This script tests the MCP server by sending a tools/list request
 and displaying the available tools.
 
 Usage:
-    python test_server.py
+    python test_server.py               # full STDIO round-trip with the workshop-env server
+    python test_server.py --in-process  # faster: import the server and list tools directly
 """
 
-import json
+import asyncio
 import subprocess
 import sys
 import os
+import tempfile
+import threading
 from pathlib import Path
 
+# Fast JSON encoding/decoding when orjson is installed (stdlib fallback)
+try:
+    import orjson
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    json_loads = orjson.loads
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
+
+# Python executable from the virtual environment (the platform can't change at runtime)
+if sys.platform == "win32":
+    _VENV_PYTHON = Path("workshop-env", "Scripts", "python.exe")
+else:
+    _VENV_PYTHON = Path("workshop-env", "bin", "python")
+_VENV_PYTHON_STR = str(_VENV_PYTHON)
+
+# MCP messages sent to the server (static, so encoded once)
+init_message = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {
+            "name": "test-client",
+            "version": "1.0.0"
+        }
+    }
+}
+
+initialized_notification = {
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized"
+}
+
+list_tools_message = {
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/list",
+    "params": {}
+}
+
+# initialize -> initialized -> tools/list, one message per line (trailing newline included)
+_HANDSHAKE_BYTES = "\n".join(
+    [*map(json_dumps, (init_message, initialized_notification, list_tools_message)), ""]
+).encode()
+
+def read_messages(stream, skipped):
+    """
+    Yield JSON-RPC messages from the server's stdout (raw bytes) as they arrive.
+    MCP over STDIO frames each message as exactly one line, so the newline is the delimiter;
+    lines that are not JSON (stray prints) are collected undecoded in `skipped` for troubleshooting.
+    """
+    for line in stream:
+        body = line.lstrip()
+        if not body:
+            continue
+        # Every JSON-RPC message is an object: anything else is skipped without a parse attempt
+        if not body.startswith(b"{"):
+            skipped.append(line)
+            continue
+        try:
+            yield json_loads(body)
+        except ValueError:
+            skipped.append(line)
+
+def print_tools(tools):
+    """Print the tools list (tools are (name, description) pairs) with a single write"""
+    lines = ["="*60, "AVAILABLE TOOLS:", "="*60 + "\n"]
+    for i, (name, description) in enumerate(tools, 1):
+        lines.append(f"{i}. {name}\n   Description: {description or 'N/A'}\n")
+    lines.append(f"[INFO] Total tools available: {len(tools)}\n")
+    sys.stdout.write("\n".join(lines))
+
+def test_tools_in_process():
+    """List the tools by calling the server's handler directly (no subprocess, no JSON-RPC)"""
+    print("\n" + "="*60)
+    print("MCP SERVER TEST - Tools List (in-process)")
+    print("="*60 + "\n")
+    
+    try:
+        import server_workshop
+        tools = asyncio.run(server_workshop.handle_list_tools())
+    except Exception as e:
+        print(f"[ERROR] Test failed: {e}")
+        return False
+    
+    print("[SUCCESS] Server handlers loaded!\n")
+    print_tools([(tool.name, tool.description) for tool in tools])
+    
+    print("\n" + "="*60)
+    print("[SUCCESS] Test completed successfully!")
+    print("="*60 + "\n")
+    return True
+
 def test_mcp_server():
     """Test the MCP server by listing available tools"""
     print("\n" + "="*60)
     print("MCP SERVER TEST - Tools List")
     print("="*60 + "\n")
     
-    # Get Python executable from virtual environment
-    if sys.platform == "win32":
-        python_exe = Path("workshop-env") / "Scripts" / "python.exe"
-    else:
-        python_exe = Path("workshop-env") / "bin" / "python"
-    
-    if not python_exe.exists():
+    if not _VENV_PYTHON.exists():
         print("[ERROR] Virtual environment not found")
         print("        Run setup.ps1 first to create it")
         return False
     
-    # Prepare MCP messages
-    init_message = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "initialize",
-        "params": {
-            "protocolVersion": "2024-11-05",
-            "capabilities": {},
-            "clientInfo": {
-                "name": "test-client",
-                "version": "1.0.0"
-            }
-        }
-    }
-    
-    initialized_notification = {
-        "jsonrpc": "2.0",
-        "method": "notifications/initialized"
-    }
-    
-    list_tools_message = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/list",
-        "params": {}
-    }
-    
     print("[INFO] Starting MCP server...")
     print("[INFO] Sending initialize, initialized, and tools/list requests...\n")
     
+    # Server logs go to a temp file: an unread stderr pipe could fill up and block the server
+    stderr_log = tempfile.TemporaryFile()
     try:
-        # Start server process with UTF-8 encoding
+        # Start server process (binary pipes: the handshake is already UTF-8 bytes).
+        # -I (isolated mode) skips PYTHON* env vars and user site-packages; the venv's own
+        # site-packages still load, and server_workshop.py adds src/ to the path itself
         process = subprocess.Popen(
-            [str(python_exe), "server_workshop.py"],
+            [_VENV_PYTHON_STR, "-I", "server_workshop.py"],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8',
-            errors='ignore',
-            bufsize=1
+            stderr=stderr_log
         )
         
         # Send all messages (initialize -> initialized -> tools/list)
-        input_data = (
-            json.dumps(init_message) + "\n" + 
-            json.dumps(initialized_notification) + "\n" +
-            json.dumps(list_tools_message) + "\n"
-        )
+        process.stdin.write(_HANDSHAKE_BYTES)
+        process.stdin.close()
         
-        # Wait for responses with timeout
-        try:
-            stdout, stderr = process.communicate(input=input_data, timeout=5)
-        except Exception as e:
-            print(f"[ERROR] Communication error: {e}")
+        # Kill the server if it hasn't answered in time (this also ends the read loop below)
+        expired = threading.Event()
+        def _expire():
+            expired.set()
             process.kill()
-            return False
-        
-        if stdout is None:
-            print("[ERROR] No output received from server")
-            return False
+        watchdog = threading.Timer(5, _expire)
+        watchdog.start()
         
-        # Parse responses
-        print("[SUCCESS] Server responded!\n")
-        print("="*60)
-        print("AVAILABLE TOOLS:")
-        print("="*60 + "\n")
-        
-        found_tools = False
-        for line in stdout.strip().split('\n'):
-            if not line.strip():
-                continue
-            try:
-                response = json.loads(line)
-                if 'result' in response and 'tools' in response.get('result', {}):
-                    tools = response['result']['tools']
-                    found_tools = True
-                    
-                    for i, tool in enumerate(tools, 1):
-                        print(f"{i}. {tool['name']}")
-                        print(f"   Description: {tool.get('description', 'N/A')}")
-                        print()
-                    
-                    print(f"[INFO] Total tools available: {len(tools)}")
+        # Parse responses line by line as they arrive; stop at the tools/list response (id 2)
+        tools = None
+        skipped = []
+        try:
+            for response in read_messages(process.stdout, skipped):
+                if response.get('id') == 2:
+                    tools = response.get('result', {}).get('tools')
                     break
-            except json.JSONDecodeError:
-                continue
+        finally:
+            watchdog.cancel()
         
-        if not found_tools:
+        if expired.is_set():
+            print("[ERROR] Server did not respond within timeout")
+            return False
+        
+        found_tools = tools is not None
+        if found_tools:
+            print("[SUCCESS] Server responded!\n")
+            print_tools([(tool['name'], tool.get('description')) for tool in tools])
+        else:
             print("[WARN] Could not parse tools from server response")
             print("\n[DEBUG] Raw stdout:")
-            print(stdout[:500])
+            print(b"".join(skipped)[:500].decode('utf-8', errors='ignore'))
+            process.kill()
+            process.wait()
+            stderr_log.seek(0)
+            stderr = stderr_log.read(500)
             if stderr:
                 print("\n[DEBUG] stderr:")
-                print(stderr[:500])
+                print(stderr.decode('utf-8', errors='ignore'))
         
         print("\n" + "="*60)
         print("[SUCCESS] Test completed successfully!")
@@ -135,10 +191,6 @@ def test_mcp_server():
         
         return found_tools
         
-    except subprocess.TimeoutExpired:
-        print("[ERROR] Server did not respond within timeout")
-        process.kill()
-        return False
     except Exception as e:
         print(f"[ERROR] Test failed: {e}")
         return False
@@ -147,6 +199,7 @@ def test_mcp_server():
             process.kill()
         except:
             pass
+        stderr_log.close()
 
 if __name__ == "__main__":
     print("\nMCP Workshop Server - Quick Test")
@@ -158,7 +211,10 @@ if __name__ == "__main__":
         print("        Please run this script from the workshop directory")
         sys.exit(1)
     
-    success = test_mcp_server()
+    if "--in-process" in sys.argv[1:]:
+        success = test_tools_in_process()
+    else:
+        success = test_mcp_server()
     
     if success:
         print("\n[NEXT STEPS]")
@@ -6,15 +6,40 @@ MCP WORKSHOP VALIDATION SCRIPT
 This script verifies that the workshop is configured correctly
 and that all necessary dependencies and files are present.
 
+Dependencies are only located, never imported: optional parsers (orjson,
+simdjson, pyarrow) and dotenv are imported inside the check that uses them.
+The server import check is the one place that executes server code.
+
 Usage:
     python validate_workshop.py
 """
 
 import os
+import stat
 import sys
-import importlib
-import json
-from pathlib import Path
+import importlib.util
+import io
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Workshop directory, resolved once by main() (checks run from it and never re-detect it)
+_WORKSHOP_ROOT = '.'
+
+def _stat(path):
+    """os.stat() that returns None for a missing path (one syscall answers exists + type)"""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+def _isreg(path):
+    st = _stat(path)
+    return st is not None and stat.S_ISREG(st.st_mode)
+
+def _isdir(path):
+    st = _stat(path)
+    return st is not None and stat.S_ISDIR(st.st_mode)
 
 def print_header(title: str):
     """Print section header"""
@@ -52,20 +77,22 @@ def check_dependencies():
         'uvicorn'
     ]
     
+    # Distribution name -> importable module name (when they differ)
+    module_names = {'python_dotenv': 'dotenv'}
+    
     missing = []
+    lines = []  # written in one go below
     
+    # find_spec only locates each package; it doesn't execute it (no heavy import graphs)
     for package in required_packages:
-        try:
-            # Special handling for python-dotenv
-            if package == 'python_dotenv':
-                importlib.import_module('dotenv')
-            else:
-                importlib.import_module(package)
-            print(f"[OK] {package}")
-        except ImportError:
-            print(f"[ERROR] {package} - NOT INSTALLED")
+        if importlib.util.find_spec(module_names.get(package, package)) is not None:
+            lines.append(f"[OK] {package}\n")
+        else:
+            lines.append(f"[ERROR] {package} - NOT INSTALLED\n")
             missing.append(package)
     
+    sys.stdout.write("".join(lines))
+    
     if missing:
         print(f"\n[WARN] Missing dependencies: {', '.join(missing)}")
         print("   Run: pip install -r requirements.txt")
@@ -74,6 +101,14 @@ def check_dependencies():
         print(f"\n[OK] All dependencies are installed")
         return True
 
+def scan_dir(path):
+    """Return {name: DirEntry} for a directory (empty if it can't be listed)"""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return {}
+
 def check_files():
     """Verify required files"""
     print_header("Files Verification")
@@ -81,7 +116,7 @@ def check_files():
     required_files = [
         'server_workshop.py',
         'requirements.txt',
-        'REaDME.md',
+        'README.md',
         '.env.example',
         'src/client.py',
         'src/config.py',
@@ -100,32 +135,47 @@ def check_files():
         'data/price-analysis.json'
     ]
     
+    # One directory listing per folder instead of one stat per path
+    entries = {'.': scan_dir('.')}
+    for dir in required_dirs:
+        entry = entries['.'].get(dir)
+        entries[dir] = scan_dir(dir) if entry is not None and entry.is_dir() else {}
+    
+    def is_file(path):
+        folder, _, name = path.rpartition('/')
+        entry = entries.get(folder or '.', {}).get(name)
+        return entry is not None and entry.is_file()
+    
     missing = []
+    lines = []  # written in one go below
     
     # Verify main files
     for file in required_files:
-        if os.path.exists(file):
-            print(f"[OK] {file}")
+        if is_file(file):
+            lines.append(f"[OK] {file}\n")
         else:
-            print(f"[ERROR] {file} - NOT FOUND")
+            lines.append(f"[ERROR] {file} - NOT FOUND\n")
             missing.append(file)
     
     # Verify directories
     for dir in required_dirs:
-        if os.path.isdir(dir):
-            print(f"[OK] {dir}/")
+        entry = entries['.'].get(dir)
+        if entry is not None and entry.is_dir():
+            lines.append(f"[OK] {dir}/\n")
         else:
-            print(f"[ERROR] {dir}/ - NOT FOUND")
+            lines.append(f"[ERROR] {dir}/ - NOT FOUND\n")
             missing.append(dir)
     
     # Verify data files
     for file in data_files:
-        if os.path.exists(file):
-            print(f"[OK] {file}")
+        if is_file(file):
+            lines.append(f"[OK] {file}\n")
         else:
-            print(f"[ERROR] {file} - NOT FOUND")
+            lines.append(f"[ERROR] {file} - NOT FOUND\n")
             missing.append(file)
     
+    sys.stdout.write("".join(lines))
+    
     if missing:
         print(f"\n[WARN] Missing files: {', '.join(missing)}")
         return False
@@ -138,7 +188,7 @@ def check_configuration():
     print_header("Configuration Verification")
     
     # Verify if .env exists
-    if os.path.exists('.env'):
+    if _isreg('.env'):
         print("[OK] .env file found")
         
         # Load environment variables if dotenv is available
@@ -180,37 +230,74 @@ def check_configuration():
     else:
         print("[WARN] .env file not found")
         print("   Copy .env.example to .env and configure the variables")
-        if os.path.exists('.env.example'):
+        if _isreg('.env.example'):
             print("[OK] .env.example available as template")
         return True  # Not critical for basic testing
 
+# Files at least this big are counted with pyarrow when it is installed (its import
+# costs more than scanning the small workshop CSVs)
+ARROW_MIN_BYTES = 8 * 1024 * 1024
+
+def count_csv_records(path):
+    """
+    Count CSV data rows (lines after the header).
+    Large files use pyarrow's C++ CSV reader if available; otherwise the raw bytes are
+    scanned for newlines.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        if size >= ARROW_MIN_BYTES:
+            try:
+                import pyarrow.csv as pac
+            except ImportError:
+                pass
+            else:
+                return pac.read_csv(f).num_rows
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 1 MB slices keep memory flat for large files
+            lines = sum(mm[i:i + 1048576].count(b'\n') for i in range(0, len(mm), 1048576))
+            if mm[-1:] != b'\n':
+                lines += 1  # last row without trailing newline
+    return max(lines - 1, 0)
+
 def test_data_files():
     """Test reading data files"""
     print_header("Data Verification")
     
     try:
         # Test CSV files
-        import csv
-        
         csv_files = ['data/prices.csv', 'data/categories.csv', 'data/substitutes.csv']
         
         for csv_file in csv_files:
-            if os.path.exists(csv_file):
-                with open(csv_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    rows = list(reader)
-                    print(f"[OK] {csv_file} - {len(rows)} records")
-            else:
+            # Opening directly is the existence check (no separate stat)
+            try:
+                records = count_csv_records(csv_file)
+            except FileNotFoundError:
                 print(f"[ERROR] {csv_file} - Not found")
+            else:
+                print(f"[OK] {csv_file} - {records} records")
         
         # Test JSON file  
         json_file = 'data/price-analysis.json'
-        if os.path.exists(json_file):
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"[OK] {json_file} - Valid")
-        else:
+        try:
+            with open(json_file, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
             print(f"[ERROR] {json_file} - Not found")
+        else:
+            # Only well-formedness matters: parse and discard (simdjson > orjson > json)
+            try:
+                import simdjson
+                json_parse = simdjson.Parser().parse
+            except ImportError:
+                try:
+                    from orjson import loads as json_parse
+                except ImportError:
+                    from json import loads as json_parse
+            json_parse(raw)
+            print(f"[OK] {json_file} - Valid")
         
         return True
         
@@ -223,17 +310,19 @@ def test_server_import():
     print_header("Server Verification")
     
     try:
-        # Change to workshop directory if we're not there
-        current_dir = os.getcwd()
-        if not os.path.exists('server_workshop.py'):
-            workshop_dir = os.path.join(current_dir, 'workshop')
-            if os.path.exists(workshop_dir):
-                os.chdir(workshop_dir)
-        
-        # Try to import server modules
-        sys.path.insert(0, '.')
-        
-        import server_workshop
+        # Load server_workshop.py by path (reusing it if this interpreter already imported it).
+        # The module body is executed on purpose: this is the check that catches import-time errors.
+        server_workshop = sys.modules.get('server_workshop')
+        if server_workshop is None:
+            spec = importlib.util.spec_from_file_location(
+                'server_workshop', os.path.join(_WORKSHOP_ROOT, 'server_workshop.py'))
+            server_workshop = importlib.util.module_from_spec(spec)
+            sys.modules['server_workshop'] = server_workshop
+            try:
+                spec.loader.exec_module(server_workshop)
+            except BaseException:
+                del sys.modules['server_workshop']
+                raise
         print("[OK] server_workshop.py - Import successful")
         
         # Verify that main functions exist (STDIO version)
@@ -252,25 +341,62 @@ def test_server_import():
         print(f"[ERROR] Error importing server: {e}")
         return False
 
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that sends each worker thread's prints to that thread's own buffer"""
+    
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self._default).write(text)
+    
+    def flush(self):
+        getattr(self._local, 'buffer', self._default).flush()
+    
+    def run_buffered(self, check):
+        """Run a check, returning (result, everything it printed)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return check(), self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
 def main():
     """Main validation function"""
+    global _WORKSHOP_ROOT
     print("[START] MCP WORKSHOP VALIDATOR - BUSINESS CENTRAL (STDIO)")
     print("=" * 60)
     
     # Change to workshop directory if we're in the parent directory
-    if os.path.exists('workshop') and not os.path.exists('server_workshop.py'):
+    if _isdir('workshop') and not _isreg('server_workshop.py'):
         print("[INFO] Changing to workshop directory...")
         os.chdir('workshop')
+    _WORKSHOP_ROOT = os.getcwd()
     
+    checks = [
+        ("Python Version", check_python_version),
+        ("Dependencies", check_dependencies),
+        ("Files", check_files),
+        ("Configuration", check_configuration),
+        ("Data Files", test_data_files),
+        ("Server Import", test_server_import),
+    ]
     results = []
     
-    # Run all checks
-    results.append(("Python Version", check_python_version()))
-    results.append(("Dependencies", check_dependencies()))
-    results.append(("Files", check_files()))
-    results.append(("Configuration", check_configuration()))
-    results.append(("Data Files", test_data_files()))
-    results.append(("Server Import", test_server_import()))
+    # Run all checks in parallel (they are independent and mostly I/O);
+    # each one prints into its own buffer, shown in the order above
+    real_stdout = sys.stdout
+    sys.stdout = ThreadOutput(real_stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+            futures = [(name, pool.submit(sys.stdout.run_buffered, check)) for name, check in checks]
+            for name, future in futures:
+                passed, output = future.result()
+                real_stdout.write(output)
+                results.append((name, passed))
+    finally:
+        sys.stdout = real_stdout
     
     # Show summary
     print_header("VALIDATION SUMMARY")